@@ -1,5 +1,4 @@
 import numpy as np
-import pandas as pd
 
 
 '''
@@ -264,67 +263,71 @@ for i in range(len(electricity_cyclone)):
     net_savings_cyclone.append(calculate_net_savings(emis_avoid_cyclone[i], emis_list_cyclone[i], GWP_residue_cyclone[i]))
     net_savings_cyclone_secondary.append(calculate_net_savings(emis_avoid_cyclone_secondary[i], emis_list_cyclone[i], GWP_residue_cyclone[i]))
 
-for case in range(len(net_savings_trial)):
-    print(f'Total Savings (base case, {(1+case)*5}% plastic): {net_savings_base[case]}')
-    print(f'Total Savings (trial case, {(1+case)*5}% plastic): {net_savings_trial[case]}')
-    print(f'Total Savings (base case, secondary, {(1+case)*5}% plastic): {net_savings_base_secondary[case]}')
-    print(f'Total Savings (trial case, secondary, {(1+case)*5}% plastic): {net_savings_trial_secondary[case]}')
-    print(f'Total Savings (cyclone case, {(1+case)*5}% plastic): {net_savings_cyclone[case]}')
-    print(f'Total Savings (cyclone case, secondary, {(1+case)*5}% plastic): {net_savings_cyclone_secondary[case]}')
-    
-## TRASNFERRING DATA INTO DATAFRAMES
-
-# percentage of plastic that falls through glass breaker screen
-plastic_percentages = ['5%', '10%', '15%']
-
-# Function that extracts GWP from recovery from the emissions lists and put them into a vector  
-def get_GWP_recovery(emis_list):
-    GWP_recovery = [emis_list[0][0], emis_list[1][0], emis_list[2][0]]
-    return GWP_recovery
-
-# Extracting GWP for each plastic % case
-GWP_recovery_base = get_GWP_recovery(emis_list_base)
-GWP_recovery_trial = get_GWP_recovery(emis_list_trial)
-GWP_recovery_cyclone = get_GWP_recovery(emis_list_cyclone)
-
-
-# Dataframe for emissions from recovery (recovery/landfilling data)
-df_recovery = pd.DataFrame()
-df_recovery['Plastic %'] = plastic_percentages
-# sum GWP from recovery and residue disposal
-df_recovery['Base'] = [sum(x) for x in zip(GWP_recovery_base, GWP_residue_base)]
-df_recovery['Trial'] = [sum(x) for x in zip(GWP_recovery_trial, GWP_residue_trial)]
-df_recovery['Cyclone'] = [sum(x) for x in zip(GWP_recovery_cyclone, GWP_residue_cyclone)]
-
-print('Emissions from recovery:')
-print(df_recovery)
-
-# DataFrames for summed avoided emissions
-df_avoided = pd.DataFrame()
-df_avoided['Plastic %'] = ['5%', '10%', '15%']
-df_avoided['Base'] = [sum(emis_avoid_base[0]), sum(emis_avoid_base[1]), sum(emis_avoid_base[2])]
-df_avoided['Trial'] = [sum(emis_avoid_trial[0]), sum(emis_avoid_trial[1]), sum(emis_avoid_trial[2])]
-df_avoided['Cyclone'] = [sum(emis_avoid_cyclone[0]), sum(emis_avoid_cyclone[1]), sum(emis_avoid_cyclone[2])]
-
-print('Avoided Emissions (without secondary processing):')
-print(df_avoided)
-
-df_avoided_secondary = pd.DataFrame()
-df_avoided_secondary['Plastic %'] = ['5%', '10%', '15%']
-df_avoided_secondary['Base secondary'] = [sum(emis_avoid_base_secondary[0]), sum(emis_avoid_base_secondary[1]), sum(emis_avoid_base_secondary[2])]
-df_avoided_secondary['Trial secondary'] = [sum(emis_avoid_trial_secondary[0]), sum(emis_avoid_trial_secondary[1]), sum(emis_avoid_trial_secondary[2])]
-df_avoided_secondary['Cyclone secondary'] = [sum(emis_avoid_cyclone_secondary[0]), sum(emis_avoid_cyclone_secondary[1]), sum(emis_avoid_cyclone_secondary[2])]
-
-print('Avoided Emissions (with secondary processing):')
-print(df_avoided_secondary)
-
-# Putting net emissions impact in data frame
-df_net = pd.DataFrame()
-df_net['Plastic %'] = ['5%', '10%', '15%']
-df_net['Base'] = (-1 * df_avoided['Base']) + df_recovery['Base']
-df_net['Trial'] = (-1 * df_avoided['Trial']) + df_recovery['Trial']
-df_net['Base secondary'] = (-1 * df_avoided_secondary['Base secondary']) + df_recovery['Base']
-df_net['Trial secondary'] = (-1 * df_avoided_secondary['Trial secondary']) + df_recovery['Trial']
-
-print('Net Emissions:')
-print(df_net)
+# Only print and tabulate results when run as a script so the inputs and results above can be imported without loading pandas
+if __name__ == '__main__':
+    import pandas as pd
+
+    for case in range(len(net_savings_trial)):
+        print(f'Total Savings (base case, {(1+case)*5}% plastic): {net_savings_base[case]}')
+        print(f'Total Savings (trial case, {(1+case)*5}% plastic): {net_savings_trial[case]}')
+        print(f'Total Savings (base case, secondary, {(1+case)*5}% plastic): {net_savings_base_secondary[case]}')
+        print(f'Total Savings (trial case, secondary, {(1+case)*5}% plastic): {net_savings_trial_secondary[case]}')
+        print(f'Total Savings (cyclone case, {(1+case)*5}% plastic): {net_savings_cyclone[case]}')
+        print(f'Total Savings (cyclone case, secondary, {(1+case)*5}% plastic): {net_savings_cyclone_secondary[case]}')
+
+    ## TRASNFERRING DATA INTO DATAFRAMES
+
+    # percentage of plastic that falls through glass breaker screen
+    plastic_percentages = ['5%', '10%', '15%']
+
+    # Function that extracts GWP from recovery from the emissions lists and put them into a vector  
+    def get_GWP_recovery(emis_list):
+        GWP_recovery = [emis_list[0][0], emis_list[1][0], emis_list[2][0]]
+        return GWP_recovery
+
+    # Extracting GWP for each plastic % case
+    GWP_recovery_base = get_GWP_recovery(emis_list_base)
+    GWP_recovery_trial = get_GWP_recovery(emis_list_trial)
+    GWP_recovery_cyclone = get_GWP_recovery(emis_list_cyclone)
+
+
+    # Dataframe for emissions from recovery (recovery/landfilling data)
+    df_recovery = pd.DataFrame()
+    df_recovery['Plastic %'] = plastic_percentages
+    # sum GWP from recovery and residue disposal
+    df_recovery['Base'] = [sum(x) for x in zip(GWP_recovery_base, GWP_residue_base)]
+    df_recovery['Trial'] = [sum(x) for x in zip(GWP_recovery_trial, GWP_residue_trial)]
+    df_recovery['Cyclone'] = [sum(x) for x in zip(GWP_recovery_cyclone, GWP_residue_cyclone)]
+
+    print('Emissions from recovery:')
+    print(df_recovery)
+
+    # DataFrames for summed avoided emissions
+    df_avoided = pd.DataFrame()
+    df_avoided['Plastic %'] = ['5%', '10%', '15%']
+    df_avoided['Base'] = [sum(emis_avoid_base[0]), sum(emis_avoid_base[1]), sum(emis_avoid_base[2])]
+    df_avoided['Trial'] = [sum(emis_avoid_trial[0]), sum(emis_avoid_trial[1]), sum(emis_avoid_trial[2])]
+    df_avoided['Cyclone'] = [sum(emis_avoid_cyclone[0]), sum(emis_avoid_cyclone[1]), sum(emis_avoid_cyclone[2])]
+
+    print('Avoided Emissions (without secondary processing):')
+    print(df_avoided)
+
+    df_avoided_secondary = pd.DataFrame()
+    df_avoided_secondary['Plastic %'] = ['5%', '10%', '15%']
+    df_avoided_secondary['Base secondary'] = [sum(emis_avoid_base_secondary[0]), sum(emis_avoid_base_secondary[1]), sum(emis_avoid_base_secondary[2])]
+    df_avoided_secondary['Trial secondary'] = [sum(emis_avoid_trial_secondary[0]), sum(emis_avoid_trial_secondary[1]), sum(emis_avoid_trial_secondary[2])]
+    df_avoided_secondary['Cyclone secondary'] = [sum(emis_avoid_cyclone_secondary[0]), sum(emis_avoid_cyclone_secondary[1]), sum(emis_avoid_cyclone_secondary[2])]
+
+    print('Avoided Emissions (with secondary processing):')
+    print(df_avoided_secondary)
+
+    # Putting net emissions impact in data frame
+    df_net = pd.DataFrame()
+    df_net['Plastic %'] = ['5%', '10%', '15%']
+    df_net['Base'] = (-1 * df_avoided['Base']) + df_recovery['Base']
+    df_net['Trial'] = (-1 * df_avoided['Trial']) + df_recovery['Trial']
+    df_net['Base secondary'] = (-1 * df_avoided_secondary['Base secondary']) + df_recovery['Base']
+    df_net['Trial secondary'] = (-1 * df_avoided_secondary['Trial secondary']) + df_recovery['Trial']
+
+    print('Net Emissions:')
+    print(df_net)
@@ -1,4 +1,3 @@
-import matplotlib.pyplot as plt
 import numpy as np
 
 '''
@@ -108,28 +107,31 @@ for i in range(len(revenue_cyclone)):
 breakeven_time = [total_investment_cost/(profit_yearly[i]-total_yearly_cost[i]) for i in range(len(profit_yearly))]
 
 
-## PLOTTING
-# Figure 1: ROI and Breakeven Time
-fig1 = plt.figure()
+# Only plot when run as a script so the inputs and results above can be imported without loading matplotlib
+if __name__ == '__main__':
+    import matplotlib.pyplot as plt
 
-ax1 = fig1.add_subplot(111)
-ax2 = ax1.twinx()
+    ## PLOTTING
+    # Figure 1: ROI and Breakeven Time
+    fig1 = plt.figure()
 
-width = 0.25
+    ax1 = fig1.add_subplot(111)
+    ax2 = ax1.twinx()
 
-x = np.arange(len(['5%', '10%', '15%']))
+    width = 0.25
 
-ax1.bar(x, ROI_1yr, width, color = 'lightgreen')
-ax2.bar(x+width, breakeven_time, width, color = 'forestgreen')
-ax1.set_xticks(x+0.5*width, ['5%', '10%', '15%'])
-ax1.set_xlabel('Plastic %')
-ax1.set_ylabel('ROI over 1 yr (%)', color = 'lightgreen')
-ax2.set_ylabel('Breakeven time (years)', color = 'forestgreen')
+    x = np.arange(len(['5%', '10%', '15%']))
 
-ytick_positions = np.arange(0,400+1, 100)
-ax1.set_yticks(ytick_positions)
+    ax1.bar(x, ROI_1yr, width, color = 'lightgreen')
+    ax2.bar(x+width, breakeven_time, width, color = 'forestgreen')
+    ax1.set_xticks(x+0.5*width, ['5%', '10%', '15%'])
+    ax1.set_xlabel('Plastic %')
+    ax1.set_ylabel('ROI over 1 yr (%)', color = 'lightgreen')
+    ax2.set_ylabel('Breakeven time (years)', color = 'forestgreen')
 
-fig1.set_size_inches(7,6)
+    ytick_positions = np.arange(0,400+1, 100)
+    ax1.set_yticks(ytick_positions)
 
-plt.show()
+    fig1.set_size_inches(7,6)
 
+    plt.show()
@@ -0,0 +1,218 @@
+import argparse
+import cProfile
+import json
+import os
+import platform
+import re
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+'''
+
+This code measures how long the TEA and LCA models take and writes the results to a JSON file so that runs can be
+compared over time. It has four stages:
+
+    import  - cold import of Hocken_TEA.py, Hocken_LCA.py and Hocken_scenarios.py, each in a fresh Python process
+    script  - running Hocken_TEA.py and Hocken_LCA.py as scripts (as in the manuscript), each in a fresh Python process
+    single  - evaluating one scenario with each model (Hocken_scenarios.py), including converting the scenario to arrays
+    batch   - evaluating large batches of random scenarios (default 1,000, 100,000 and 1,000,000): the array maths of each
+              model, converting scenario dictionaries to arrays, and the full JSON-ready path from dictionaries to results.
+              The dictionary runs take ~20x longer than the array maths and need ~4 GB at 1,000,000 scenarios, so by
+              default they only run for sizes up to 100,000 (change with --max-dict-size).
+
+Each stage can be profiled with cProfile (--profile cprofile, one .prof file per stage and model) or with the py-spy
+sampling profiler if it is installed (--profile sampling, one flame graph per stage). The path of each profile is
+recorded with the timings in the JSON file.
+
+Example:
+
+    python Hocken_benchmark.py --stages single batch --sizes 1000 1000000 --output benchmark_results.json
+
+'''
+
+
+stages = ['import', 'script', 'single', 'batch']
+here = os.path.dirname(os.path.abspath(__file__))
+
+
+# This function times func() `repeat` times and returns summary statistics in seconds
+def time_repeats(func, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return summarize(times)
+
+
+# This function runs python code in a fresh process (so nothing is already imported) with a non-interactive plotting
+# backend, and returns the wall time reported by the child process
+def run_fresh(code):
+    env = dict(os.environ, MPLBACKEND='Agg')
+    timed = f'import time\nstart = time.perf_counter()\n{code}\nprint(time.perf_counter() - start)'
+    result = subprocess.run([sys.executable, '-c', timed], cwd=here, env=env, capture_output=True, text=True, check=True)
+    return float(result.stdout.splitlines()[-1])
+
+
+def summarize(times):
+    return {'repeat': len(times), 'min_s': min(times), 'median_s': statistics.median(times), 'mean_s': statistics.mean(times)}
+
+
+# This function generates n random scenarios directly as arrays (see Hocken_scenarios.get_scenario_inputs), with
+# parameters spread +/-50% around their defaults
+def get_random_inputs(n, seed=0):
+    import numpy as np
+    import Hocken_scenarios as scenarios
+
+    rng = np.random.default_rng(seed)
+    inputs = {'case': rng.integers(0, len(scenarios.cases), n)}
+    for key, default in scenarios.default_parameters.items():
+        inputs[key] = np.asarray(default, dtype=float) * rng.uniform(0.5, 1.5, (n,) + np.shape(default))
+    return inputs
+
+
+# This function generates n random scenarios as dictionaries, as they arrive from the service or a report file. Each
+# sets the case and a few parameters, which keeps a million of them (and their results) within a few GB of memory.
+def get_random_scenarios(n, seed=0):
+    inputs = get_random_inputs(n, seed)
+    columns = [inputs['case'].tolist()] + [inputs[key].tolist() for key in ['electricity_cost', 'diesel_cost', 'col_dist']]
+    return [{'case': case, 'electricity_cost': electricity_cost, 'diesel_cost': diesel_cost, 'col_dist': col_dist}
+            for case, electricity_cost, diesel_cost, col_dist in zip(*columns)]
+
+
+## STAGES
+# Each stage returns a list (or generator) of (name, function to time or code to time in a fresh process, scenarios per
+# call, repeats)
+
+def get_import_stage(repeat):
+    return [(f'import {module}', f'import {module}', None, repeat) for module in ['Hocken_TEA', 'Hocken_LCA', 'Hocken_scenarios']]
+
+
+def get_script_stage(repeat):
+    # runpy runs the file as __main__, so the plot is made (not shown, with the Agg backend) and the tables are printed
+    return [(f'run {script}', f"import runpy, contextlib, io\nwith contextlib.redirect_stdout(io.StringIO()): "
+             f"runpy.run_path('{script}', run_name='__main__')", None, repeat) for script in ['Hocken_TEA.py', 'Hocken_LCA.py']]
+
+
+def get_single_stage(repeat):
+    import Hocken_scenarios as scenarios
+
+    scenario = [{'case': '10%'}]
+    return [('single TEA', lambda: scenarios.evaluate_TEA(scenarios.get_scenario_inputs(scenario)), 1, repeat),
+            ('single LCA', lambda: scenarios.evaluate_LCA(scenarios.get_scenario_inputs(scenario)), 1, repeat),
+            ('single TEA+LCA (JSON-ready)', lambda: scenarios.evaluate_scenarios(scenario), 1, repeat)]
+
+
+# This generator builds the scenarios of one size only when its runs are reached, so that only one size is held in
+# memory at a time. Each run is timed before the generator resumes, so the data can be deleted after its last run.
+def get_batch_stage(repeat, sizes, max_dict_size):
+    import Hocken_scenarios as scenarios
+
+    for n in sizes:
+        inputs = get_random_inputs(n)
+        yield (f'batch TEA n={n}', lambda: scenarios.evaluate_TEA(inputs), n, repeat)
+        yield (f'batch LCA n={n}', lambda: scenarios.evaluate_LCA(inputs), n, repeat)
+        del inputs
+        # the Python-level work around the array maths grows with the number of scenarios as well
+        if n <= max_dict_size:
+            scenario_list = get_random_scenarios(n)
+            yield (f'batch inputs n={n}', lambda: scenarios.get_scenario_inputs(scenario_list), n, repeat)
+            yield (f'batch TEA+LCA (JSON-ready) n={n}', lambda: scenarios.evaluate_scenarios(scenario_list), n, repeat)
+            del scenario_list
+
+
+# This function runs one stage and returns its results. Fresh-process stages (import, script) are timed in child
+# processes; with cProfile they are profiled in the child process as well.
+def run_stage(stage, args):
+    if stage in ('import', 'script'):
+        runs = get_import_stage(args.repeat_fresh) if stage == 'import' else get_script_stage(args.repeat_fresh)
+    elif stage == 'single':
+        runs = get_single_stage(args.repeat)
+    else:
+        runs = get_batch_stage(args.repeat_batch, args.sizes, args.max_dict_size)
+
+    results = []
+    for name, func, n_scenarios, repeat in runs:
+        if isinstance(func, str):
+            result = summarize([run_fresh(func) for _ in range(repeat)])
+            if args.profile == 'cprofile':
+                profile_file = get_profile_file(args, name, '.prof')
+                run_fresh(f'import cProfile\ncProfile.run({func!r}, {profile_file!r})')
+                result['profile'] = profile_file
+        else:
+            func() # warm up (first call pays for imports and array allocation)
+            result = time_repeats(func, repeat)
+            if args.profile == 'cprofile':
+                profile = cProfile.Profile()
+                profile.runcall(func)
+                result['profile'] = get_profile_file(args, name, '.prof')
+                profile.dump_stats(result['profile'])
+        if n_scenarios:
+            result['scenarios'] = n_scenarios
+            result['per_scenario_s'] = result['min_s'] / n_scenarios
+        results.append({'name': name, **result})
+        print(f"{name:<40} min {result['min_s'] * 1000:10.3f} ms   median {result['median_s'] * 1000:10.3f} ms")
+    return results
+
+
+def get_profile_file(args, name, extension):
+    os.makedirs(args.profile_dir, exist_ok=True)
+    return os.path.join(args.profile_dir, re.sub(r'[^\w.]+', '_', name).strip('_') + extension)
+
+
+# This function re-runs this script for one stage under the py-spy sampling profiler (an optional dependency) and
+# returns the stage's results, each with the path of the stage's flame graph
+def run_sampled_stage(stage, args):
+    py_spy = shutil.which('py-spy')
+    if py_spy is None:
+        sys.exit("--profile sampling needs py-spy (pip install py-spy)")
+    flame_graph = get_profile_file(args, stage, '.svg')
+    with tempfile.TemporaryDirectory() as directory:
+        output = os.path.join(directory, f'{stage}.json')
+        command = [py_spy, 'record', '--subprocesses', '-o', flame_graph, '--', sys.executable, os.path.abspath(__file__),
+                   '--stages', stage, '--sizes', *map(str, args.sizes), '--repeat', str(args.repeat),
+                   '--repeat-batch', str(args.repeat_batch), '--repeat-fresh', str(args.repeat_fresh),
+                   '--max-dict-size', str(args.max_dict_size), '--output', output]
+        subprocess.run(command, check=True)
+        with open(output) as file:
+            results = json.load(file)['stages'][stage]
+    print(f'{stage}: flame graph written to {flame_graph}')
+    return [{**result, 'profile': flame_graph} for result in results]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the TEA and LCA models.')
+    parser.add_argument('--stages', nargs='+', choices=stages, default=stages, help='stages to run (default: all)')
+    parser.add_argument('--sizes', nargs='+', type=int, default=[1000, 100000, 1000000], help='batch sizes')
+    parser.add_argument('--max-dict-size', type=int, default=100000,
+                        help='largest batch size for the scenario dictionary runs (default: 100000)')
+    parser.add_argument('--repeat', type=int, default=1000, help='repeats for the single stage (default: 1000)')
+    parser.add_argument('--repeat-batch', type=int, default=5, help='repeats for the batch stage (default: 5)')
+    parser.add_argument('--repeat-fresh', type=int, default=5, help='fresh processes for import/script (default: 5)')
+    parser.add_argument('--profile', choices=['cprofile', 'sampling'], help='also profile each stage')
+    parser.add_argument('--profile-dir', default='profiles', help='where profiles are written (default: profiles)')
+    parser.add_argument('--output', default='benchmark_results.json', help='JSON results file')
+    args = parser.parse_args()
+    args.profile_dir = os.path.abspath(args.profile_dir)
+
+    import numpy as np
+
+    results = {'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+               'python': platform.python_version(),
+               'numpy': np.__version__,
+               'platform': platform.platform(),
+               'stages': {}}
+    for stage in args.stages:
+        results['stages'][stage] = run_sampled_stage(stage, args) if args.profile == 'sampling' else run_stage(stage, args)
+
+    with open(args.output, 'w') as file:
+        json.dump(results, file, indent=2)
+    print(f'Results written to {args.output}')
+
+
+if __name__ == '__main__':
+    main()
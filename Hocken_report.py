@@ -0,0 +1,178 @@
+import argparse
+import csv
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+import Hocken_scenarios as scenarios
+
+'''
+
+This code writes TEA and LCA reports for any number of scenarios without a display. All scenarios are evaluated together
+by Hocken_scenarios.py, then one report per scenario is rendered in parallel across a pool of processes:
+
+    <id>.png - ROI over 1 yr and breakeven time (as in Hocken_TEA.py), net GWP savings and per-category emissions
+    <id>.csv - per-category emissions of the base, trial and cyclone cases and the net savings
+
+A summary.csv with the ROI, breakeven time and net savings of every scenario is always written. matplotlib is only
+imported when a chart is drawn, so with --numbers-only it is never loaded. Each chart takes about 0.3 s to draw (almost
+all of it in the Agg renderer), so several hundred reports take seconds only with many CPU cores: 300 reports took about
+90 s on one core.
+
+Scenarios are read from a JSON file holding a list of scenarios, or a JSON lines file with one scenario per line (see
+Hocken_scenarios.py). An optional 'id' names the report files; characters other than letters, digits, '.', '_' and '-'
+are replaced by '_', ids must be unique and 'summary' is reserved. Without a file, the three plastic % cases are reported.
+
+Example:
+
+    python Hocken_report.py scenarios.jsonl --output reports --jobs 8
+
+'''
+
+
+# This function reads scenarios from a JSON or JSON lines file and returns a list of (id, scenario)
+def read_scenarios(path):
+    with open(path) as file:
+        text = file.read()
+    try:
+        loaded = json.loads(text)
+        loaded = loaded if isinstance(loaded, list) else [loaded]
+    except ValueError:
+        loaded = [json.loads(line) for line in text.splitlines() if line.strip()]
+    return name_scenarios(loaded)
+
+
+# This function turns each scenario's id (or its position) into a safe, unique file name and returns a list of
+# (name, scenario). It raises a ValueError for scenarios that are not JSON objects, for repeated ids and for the id
+# 'summary', which would overwrite summary.csv. Ids are compared ignoring case, as some file systems do.
+def name_scenarios(loaded):
+    named = []
+    names = {'summary'}
+    for i, scenario in enumerate(loaded):
+        if not isinstance(scenario, dict):
+            raise ValueError(f'Scenario {i + 1} must be a JSON object, not {scenario!r}')
+        scenario = dict(scenario)
+        name = re.sub(r'[^\w.-]+', '_', str(scenario.pop('id', f'scenario_{i:04d}'))).strip('.') or f'scenario_{i:04d}'
+        if name.lower() in names:
+            raise ValueError(f'Scenario id {name!r} is reserved or used more than once (ids must be unique file names)')
+        names.add(name.lower())
+        named.append((name, scenario))
+    return named
+
+
+# This function writes the table of one scenario: emissions per impact category for each case, then the net savings
+def write_table(path, result):
+    with open(path, 'w', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(['Impact category'] + list(result['emissions']))
+        for key in scenarios.impact_categories:
+            writer.writerow([key] + [emissions[key] for emissions in result['emissions'].values()])
+        writer.writerow([])
+        writer.writerow(['Net savings (kg CO2 eq/t)', 'Value'])
+        for name, value in result['net_savings'].items():
+            writer.writerow([name, value])
+
+
+# This function draws the charts of one scenario and saves them as a PNG. Charts are drawn on a matplotlib Figure
+# directly (not pyplot), which always uses the non-interactive Agg canvas and keeps no global state between reports.
+def write_chart(path, name, result):
+    from matplotlib.figure import Figure
+    import numpy as np
+
+    fig = Figure(figsize=(15, 5))
+    # fixed margins instead of tight_layout, which draws the whole figure an extra time
+    fig.subplots_adjust(left = 0.05, right = 0.98, bottom = 0.25, top = 0.9, wspace = 0.45)
+    ax1, ax3, ax4 = fig.subplots(1, 3)
+
+    # Figure 1 of Hocken_TEA.py: ROI and breakeven time
+    ax2 = ax1.twinx()
+    width = 0.25
+    # values that cannot be calculated (None) are left out of the chart
+    ax1.bar(0, np.nan if result['ROI_1yr'] is None else result['ROI_1yr'], width, color = 'lightgreen')
+    ax2.bar(width, np.nan if result['breakeven_time'] is None else result['breakeven_time'], width, color = 'forestgreen')
+    ax1.set_xticks([0.5*width], [result['case']])
+    ax1.set_xlim(-2*width, 3*width)
+    ax1.set_xlabel('Plastic %')
+    ax1.set_ylabel('ROI over 1 yr (%)', color = 'lightgreen')
+    ax2.set_ylabel('Breakeven time (years)', color = 'forestgreen')
+
+    # Net GWP savings with 1:1 and secondary virgin replacement
+    net_savings = result['net_savings']
+    ax3.bar(list(net_savings), list(net_savings.values()), color = 'steelblue')
+    ax3.tick_params(axis = 'x', labelrotation = 45)
+    ax3.set_ylabel('Net savings (kg CO2 eq/t)')
+
+    # Per-category emissions of the trial and cyclone cases relative to the base case (categories have different units)
+    emissions = result['emissions']
+    x = np.arange(len(scenarios.impact_categories))
+    for offset, case, color in [(0, 'trial', 'lightgreen'), (width, 'cyclone', 'forestgreen')]:
+        relative = [emissions[case][key] / emissions['base'][key] * 100 for key in scenarios.impact_categories]
+        ax4.bar(x + offset, relative, width, color = color, label = case)
+    ax4.set_xticks(x + 0.5*width, scenarios.impact_categories)
+    ax4.set_ylabel('Emissions from recovery (% of base)')
+    ax4.legend(loc = 'center right')
+
+    fig.suptitle(name)
+    fig.savefig(path)
+
+
+# This function renders the table and chart of one scenario; it runs in the worker processes
+def render_report(job):
+    name, result, output_dir = job
+    write_table(os.path.join(output_dir, f'{name}.csv'), result)
+    write_chart(os.path.join(output_dir, f'{name}.png'), name, result)
+    return name
+
+
+# This function writes one row per scenario with the headline numbers
+def write_summary(path, named_results):
+    net_savings_keys = list(named_results[0][1]['net_savings']) if named_results else []
+    with open(path, 'w', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(['id', 'case', 'ROI_1yr', 'breakeven_time'] + [f'net_savings_{key}' for key in net_savings_keys])
+        for name, result in named_results:
+            writer.writerow([name, result['case'], result['ROI_1yr'], result['breakeven_time']] +
+                            [result['net_savings'][key] for key in net_savings_keys])
+
+
+# This function evaluates all scenarios, writes the summary and, unless numbers_only, renders the reports in parallel
+def write_reports(named_scenarios, output_dir, jobs=None, numbers_only=False):
+    os.makedirs(output_dir, exist_ok=True)
+    results = scenarios.evaluate_scenarios([scenario for _, scenario in named_scenarios])
+    named_results = [(name, result) for (name, _), result in zip(named_scenarios, results)]
+    write_summary(os.path.join(output_dir, 'summary.csv'), named_results)
+    if numbers_only:
+        return []
+
+    render_jobs = [(name, result, output_dir) for name, result in named_results]
+    if jobs == 1:
+        return [render_report(job) for job in render_jobs]
+    jobs = jobs or os.cpu_count()
+    # hand out reports in chunks so workers spend their time drawing rather than waiting on the pool
+    chunksize = max(1, len(render_jobs) // (4 * jobs))
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        return list(executor.map(render_report, render_jobs, chunksize=chunksize))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Write headless TEA and LCA reports for many scenarios.')
+    parser.add_argument('scenarios', nargs='?', help='JSON or JSON lines file of scenarios (default: the three cases)')
+    parser.add_argument('--output', default='reports', help='directory for the reports (default: reports)')
+    parser.add_argument('--jobs', type=int, help='worker processes (default: one per CPU; 1 renders in this process)')
+    parser.add_argument('--numbers-only', action='store_true', help='only write summary.csv (no charts or tables)')
+    args = parser.parse_args()
+
+    try:
+        if args.scenarios:
+            named_scenarios = read_scenarios(args.scenarios)
+        else:
+            named_scenarios = name_scenarios([{'id': case.replace('%', 'pct'), 'case': case} for case in scenarios.cases])
+        rendered = write_reports(named_scenarios, args.output, args.jobs, args.numbers_only)
+    except ValueError as error:
+        parser.error(str(error))
+    print(f'Wrote summary of {len(named_scenarios)} scenarios and {len(rendered)} reports to {args.output}')
+
+
+if __name__ == '__main__':
+    main()
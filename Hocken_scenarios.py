@@ -0,0 +1,224 @@
+import math
+
+import numpy as np
+
+import Hocken_LCA as LCA
+import Hocken_TEA as TEA
+
+'''
+
+This code evaluates the technoeconomic assessment (Hocken_TEA.py) and life cycle assessment (Hocken_LCA.py) for many
+scenarios at once. A scenario is one plastic % case ('5%', '10%' or '15%' plastics in glass stream) plus any user-defined
+parameters that should differ from the values in the two scripts. All scenarios are evaluated together with numpy arrays
+instead of one Python loop per scenario, so thousands of what-if questions cost about as much as one.
+
+Example scenario:
+
+    {'case': '10%', 'electricity_cost': 0.12, 'waste_processed_yearly': 80000, 'col_dist': 45}
+
+'''
+
+
+## INPUTS
+
+# percentage of plastic that falls through glass breaker screen
+cases = ['5%', '10%', '15%']
+
+# TEA parameters that can be changed per scenario (defaults from Hocken_TEA.py)
+TEA_parameters = {name: getattr(TEA, name) for name in ['land_cost_rate', 'construct_cost_rate', 'equipment_cost',
+                                                         'space_requirement', 'diesel_cost', 'electricity_cost',
+                                                         'residue_disposal_fee', 'bale_wire_cost', 'waste_processed_yearly',
+                                                         'waste_tipping_fees', 'equipment_maintenance']}
+
+# LCA parameters that can be changed per scenario (defaults from Hocken_LCA.py)
+LCA_parameters = {name: getattr(LCA, name) for name in ['diesel', 'col_dist', 'residue_GWP']}
+
+# Recovered material prices can also be changed per scenario, as a list in the order of LCA.recyclables
+default_parameters = {**TEA_parameters, **LCA_parameters, 'RecMat_prices': TEA.RecMat_prices}
+
+# Impact categories and emission sources, in the order used by LCA.get_emissions
+impact_categories = ['GWP', 'ODP', 'AP', 'ETP', 'EP', 'PO', 'C', 'NC', 'RE']
+emission_sources = ['Electricity', 'Collection and Transportation', 'Baling Wire', 'Diesel']
+
+# Emission factors as a (source x impact category) matrix
+EF_matrix = np.array([[LCA.EF_factors[key][source] for key in impact_categories] for source in emission_sources])
+
+# Case-dependent inputs as arrays so they can be indexed with an array of cases (one row per case)
+electricity_base = np.array(LCA.electricity_base)
+electricity_trial = np.array(LCA.electricity_trial)
+electricity_cyclone = np.array(LCA.electricity_cyclone)
+baling_wire_base = np.array(LCA.baling_wire_base)
+baling_wire_trial = np.array(LCA.baling_wire_trial)
+baling_wire_cyclone = np.array(LCA.baling_wire_cyclone)
+residue_base = np.array(LCA.residue_base)
+residue_trial = np.array(LCA.residue_trial)
+residue_cyclone = np.array(LCA.residue_cyclone)
+diesel_cyclone = np.array(TEA.diesel_cyclone)
+RecMat_cyclone = np.subtract(TEA.RecMat_trial, TEA.RecMat_base)
+
+# Avoided emissions do not depend on any scenario parameter, so they are summed once per case
+GWP = np.array(LCA.GWP)
+GWP_secondary = np.array(LCA.GWP_secondary)
+sub_ratio = np.array(LCA.sub_ratio)
+emis_avoid_base = np.array(LCA.RecMat_base) @ (GWP * 10)
+emis_avoid_trial = np.array(LCA.RecMat_trial) @ (GWP * 10)
+emis_avoid_cyclone = LCA.RecMat_cyclone @ (GWP * 10)
+emis_avoid_base_secondary = np.array(LCA.RecMat_base) @ ((GWP * sub_ratio - GWP_secondary) * 10)
+emis_avoid_trial_secondary = np.array(LCA.RecMat_trial) @ ((GWP * sub_ratio - GWP_secondary) * 10)
+emis_avoid_cyclone_secondary = LCA.RecMat_cyclone @ ((GWP * sub_ratio - GWP_secondary * sub_ratio) * 10)
+
+
+# This function returns True for finite real numbers (bools, and integers too large for a float, are not accepted)
+def is_finite_number(value):
+    if not isinstance(value, (int, float)) or isinstance(value, bool):
+        return False
+    try:
+        return math.isfinite(value)
+    except OverflowError:
+        return False
+
+
+# This function checks a single scenario and returns it with the case converted to an index (0, 1 or 2). It raises a
+# ValueError for a missing or unknown case, unknown parameters and parameter values that are not finite numbers, so
+# that a scenario which passes can always be evaluated together with others.
+def check_scenario(scenario):
+    scenario = dict(scenario)
+    if 'case' not in scenario:
+        raise ValueError(f"Scenario is missing 'case' (one of {cases})")
+    case = scenario['case']
+    if isinstance(case, str) and case in cases:
+        scenario['case'] = cases.index(case)
+    elif not (isinstance(case, int) and not isinstance(case, bool) and 0 <= case < len(cases)):
+        raise ValueError(f'Unknown case {case!r}; expected one of {cases} or an index below {len(cases)}')
+    for key, value in scenario.items():
+        if key == 'case':
+            continue
+        if key not in default_parameters:
+            raise ValueError(f'Unknown scenario parameter {key!r}')
+        if key == 'RecMat_prices':
+            if not (isinstance(value, (list, tuple)) and len(value) == len(LCA.recyclables)
+                    and all(is_finite_number(price) for price in value)):
+                raise ValueError(f'RecMat_prices needs one finite price per recyclable ({len(LCA.recyclables)})')
+        elif not is_finite_number(value):
+            raise ValueError(f'{key} must be a finite number, not {value!r}')
+    return scenario
+
+
+# This function converts a list of scenarios into a dictionary of arrays (one entry per scenario) filled with the default
+# parameters wherever a scenario does not set its own value
+def get_scenario_inputs(scenarios):
+    scenarios = [check_scenario(scenario) for scenario in scenarios]
+    inputs = {'case': np.array([scenario['case'] for scenario in scenarios], dtype=int)}
+    for key, default in default_parameters.items():
+        # reshape so that RecMat_prices keeps one column per recyclable even when there are no scenarios
+        values = np.array([scenario.get(key, default) for scenario in scenarios], dtype=float)
+        inputs[key] = values.reshape((len(scenarios),) + np.shape(default))
+    return inputs
+
+
+# This function calculates the one-time and yearly costs, ROI over 1 yr and breakeven time of adding a cyclone for every
+# scenario. Inputs can be arrays of equal length or scalars (applied to every scenario).
+def evaluate_TEA(inputs):
+    case = inputs['case']
+    waste_processed_yearly = inputs['waste_processed_yearly']
+    equipment_cost = inputs['equipment_cost']
+    space_requirement = inputs['space_requirement']
+
+    # Revenue Calcs
+    revenue_cyclone = (RecMat_cyclone[case] / 100 * inputs['RecMat_prices']).sum(axis=-1) # $/t waste
+
+    # One-time Costs
+    land_cost = (space_requirement/42560) * inputs['land_cost_rate'] # $
+    construct_cost = space_requirement * inputs['construct_cost_rate'] # $
+    project_contingencies = 0.37 * equipment_cost # $
+    legal_contractor_fees = 0.23 * equipment_cost # $
+    total_investment_cost = equipment_cost + land_cost + construct_cost + project_contingencies + legal_contractor_fees
+
+    # Yearly Costs
+    waste_tipping_cost_yearly = inputs['waste_tipping_fees'] * waste_processed_yearly # $/yr
+    diesel_cost_yearly = (diesel_cyclone[case] / 3.7854) * inputs['diesel_cost'] * waste_processed_yearly # $/yr
+    electricity_cost_yearly = electricity_cyclone[case] * inputs['electricity_cost'] * waste_processed_yearly # $/yr
+    residue_disposal_cost_yearly = (residue_cyclone[case] / 100) * inputs['residue_disposal_fee'] * waste_processed_yearly # $/yr
+    bale_wire_cost_yearly = (baling_wire_cyclone[case] / 907) * inputs['bale_wire_cost'] * waste_processed_yearly # $/yr
+    total_yearly_cost = (inputs['equipment_maintenance'] + waste_tipping_cost_yearly + diesel_cost_yearly +
+                         electricity_cost_yearly + residue_disposal_cost_yearly + bale_wire_cost_yearly)
+
+    # ROI & Breakeven; a zero denominator gives inf or nan (no warning), which evaluate_scenarios reports as None
+    profit_yearly = waste_processed_yearly * revenue_cyclone
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ROI_1yr = (profit_yearly - total_investment_cost - total_yearly_cost) / (total_investment_cost + total_yearly_cost) * 100
+        breakeven_time = total_investment_cost / (profit_yearly - total_yearly_cost)
+
+    return {'total_investment_cost': total_investment_cost, 'total_yearly_cost': total_yearly_cost,
+            'profit_yearly': profit_yearly, 'ROI_1yr': ROI_1yr, 'breakeven_time': breakeven_time}
+
+
+# This function is the array version of LCA.get_emissions. It returns the emissions of every impact category as an
+# array with one row per scenario and one column per entry in impact_categories.
+def get_emissions(facility_electricity, collection_dist, facility_diesel_use, baling_wire):
+    use = np.stack(np.broadcast_arrays(facility_electricity, collection_dist, baling_wire, facility_diesel_use), axis=-1)
+    return use @ EF_matrix
+
+
+# This function calculates the per-category emissions from recovery and the net savings of the base, trial and cyclone
+# cases for every scenario
+def evaluate_LCA(inputs):
+    case = inputs['case']
+    diesel = inputs['diesel']
+    col_dist = inputs['col_dist']
+    residue_GWP = inputs['residue_GWP']
+
+    emissions_base = get_emissions(electricity_base[case], col_dist, diesel, baling_wire_base[case])
+    emissions_trial = get_emissions(electricity_trial[case], col_dist, diesel, baling_wire_trial[case])
+    emissions_cyclone = get_emissions(electricity_cyclone[case], 0, 0, baling_wire_cyclone[case])
+
+    # GWP from landfilling residue
+    GWP_residue_base = (residue_base[case] / 100) * residue_GWP
+    GWP_residue_trial = (residue_trial[case] / 100) * residue_GWP
+    GWP_residue_cyclone = (residue_cyclone[case] / 100) * residue_GWP
+
+    # Net savings (same as LCA.calculate_net_savings); GWP is the first impact category
+    net_savings = {
+        'base': emis_avoid_base[case] - emissions_base[..., 0] - GWP_residue_base,
+        'trial': emis_avoid_trial[case] - emissions_trial[..., 0] - GWP_residue_trial,
+        'cyclone': emis_avoid_cyclone[case] - emissions_cyclone[..., 0] - GWP_residue_cyclone,
+        'base_secondary': emis_avoid_base_secondary[case] - emissions_base[..., 0] - GWP_residue_base,
+        'trial_secondary': emis_avoid_trial_secondary[case] - emissions_trial[..., 0] - GWP_residue_trial,
+        'cyclone_secondary': emis_avoid_cyclone_secondary[case] - emissions_cyclone[..., 0] - GWP_residue_cyclone}
+
+    return {'emissions': {'base': emissions_base, 'trial': emissions_trial, 'cyclone': emissions_cyclone},
+            'net_savings': net_savings}
+
+
+# This function converts an array to a list of Python numbers, with None wherever the value is not finite (JSON has no
+# inf or nan)
+def get_finite_list(values):
+    if np.isfinite(values).all():
+        return values.tolist()
+    return np.where(np.isfinite(values), values, None).tolist()
+
+
+# This function evaluates a list of scenarios with both models and returns one dictionary of plain Python numbers per
+# scenario (ready to be written as JSON). A value that cannot be calculated, such as the breakeven time when the yearly
+# profit equals the yearly cost, is None.
+def evaluate_scenarios(scenarios):
+    if not scenarios:
+        return []
+    inputs = get_scenario_inputs(scenarios)
+    tea = evaluate_TEA(inputs)
+    lca = evaluate_LCA(inputs)
+
+    case = inputs['case'].tolist()
+    ROI_1yr = get_finite_list(tea['ROI_1yr'])
+    breakeven_time = get_finite_list(tea['breakeven_time'])
+    emissions = {name: get_finite_list(values) for name, values in lca['emissions'].items()}
+    net_savings = {name: get_finite_list(values) for name, values in lca['net_savings'].items()}
+
+    results = []
+    for i in range(len(case)):
+        results.append({'case': cases[case[i]],
+                        'ROI_1yr': ROI_1yr[i],
+                        'breakeven_time': breakeven_time[i],
+                        'emissions': {name: dict(zip(impact_categories, values[i])) for name, values in emissions.items()},
+                        'net_savings': {name: values[i] for name, values in net_savings.items()}})
+    return results
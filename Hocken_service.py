@@ -0,0 +1,247 @@
+import argparse
+import json
+import os
+import queue
+import socket
+import socketserver
+import stat
+import threading
+import time
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import Hocken_scenarios as scenarios
+
+'''
+
+This code runs a long-lived local service that answers TEA and LCA what-if questions without re-running Hocken_TEA.py
+and Hocken_LCA.py. The models are imported once and kept warm. Requests that arrive at about the same time are collected
+into one batch (up to max_batch scenarios or max_wait seconds) and evaluated together by Hocken_scenarios.py.
+
+Each request is one scenario as JSON (see Hocken_scenarios.py), optionally with an 'id' that is echoed in the response.
+Each response holds the ROI over 1 yr, breakeven time, per-category emissions and net savings of that scenario, or an
+'error' message. Values that cannot be calculated (e.g. the breakeven time when yearly profit equals yearly cost) are null.
+
+Latency per request, measured on a single CPU core shared with the load generator, with keep-alive HTTP clients that all
+connect at once and each send one scenario at a time: 16 clients p50 8 ms / p99 15 ms, 32 clients p50 16 ms / p99 32 ms,
+64 clients p50 30 ms / p99 63 ms. The <10 ms target therefore holds up to about 16 concurrent clients per core. Scenarios
+pipelined over one Unix socket take about 0.12 ms each.
+
+Run over HTTP (POST a scenario or a list of scenarios to /evaluate, GET /health):
+
+    python Hocken_service.py --http 127.0.0.1:8765
+    curl -d '{"case": "10%", "electricity_cost": 0.12}' http://127.0.0.1:8765/evaluate
+
+Run over a Unix socket (one JSON scenario per line in, one JSON response per line out, in the same order):
+
+    python Hocken_service.py --unix /tmp/hocken.sock
+    echo '{"id": 1, "case": "5%"}' | nc -U /tmp/hocken.sock
+
+'''
+
+
+# This class collects scenarios from many threads and evaluates them in batches on a single worker thread
+class ScenarioBatcher:
+    def __init__(self, max_batch=512, max_wait=0.001):
+        self.max_batch = max_batch # scenarios per evaluation
+        self.max_wait = max_wait # s; how long the first scenario of a batch waits for others
+        self.requests = queue.Queue()
+        self.worker = threading.Thread(target=self._run, daemon=True)
+        self.worker.start()
+
+    # Checks a scenario right away (so one bad request cannot fail a whole batch) and returns a Future for its result
+    def submit(self, scenario):
+        future = Future()
+        try:
+            if not isinstance(scenario, dict):
+                raise ValueError('Each scenario must be a JSON object')
+            scenario = scenarios.check_scenario(scenario)
+        except (ArithmeticError, TypeError, ValueError) as error:
+            future.set_exception(error)
+        else:
+            self.requests.put((scenario, future))
+        return future
+
+    def _next_batch(self):
+        batch = [self.requests.get()]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch:
+            timeout = deadline - time.perf_counter()
+            try:
+                batch.append(self.requests.get(timeout=timeout) if timeout > 0 else self.requests.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            try:
+                results = scenarios.evaluate_scenarios([scenario for scenario, _ in batch])
+            except Exception as error:
+                for _, future in batch:
+                    future.set_exception(error)
+            else:
+                for (_, future), result in zip(batch, results):
+                    future.set_result(result)
+
+
+# This function splits the optional 'id' off a request and submits the rest as a scenario. It returns the id and a Future.
+def submit_request(batcher, request):
+    request_id = None
+    if isinstance(request, dict) and 'id' in request:
+        request = dict(request)
+        request_id = request.pop('id')
+    return request_id, batcher.submit(request)
+
+
+# This function waits for a submitted request and returns its JSON-ready response (the result or an error message)
+def get_response(request_id, future):
+    try:
+        response = future.result()
+    except Exception as error:
+        response = {'error': str(error)}
+    if request_id is not None:
+        response = {'id': request_id, **response}
+    return response
+
+
+class HTTPHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1' # keep-alive, so dashboards can reuse a connection
+    disable_nagle_algorithm = True # otherwise small responses wait ~40 ms for a delayed ACK
+
+    def do_GET(self):
+        if self.path == '/health':
+            self._send(200, {'status': 'ok'})
+        else:
+            self._send(404, {'error': f'Unknown path {self.path}'})
+
+    def do_POST(self):
+        if self.path != '/evaluate':
+            self._send(404, {'error': f'Unknown path {self.path}'})
+            return
+        try:
+            body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))))
+        except ValueError as error:
+            self._send(400, {'error': f'Invalid JSON: {error}'})
+            return
+        # a list of scenarios is submitted all at once so it lands in the same batch
+        requests = body if isinstance(body, list) else [body]
+        submitted = [submit_request(self.server.batcher, request) for request in requests]
+        responses = [get_response(request_id, future) for request_id, future in submitted]
+        self._send(200, responses if isinstance(body, list) else responses[0])
+
+    def _send(self, status, payload):
+        data = json.dumps(payload, allow_nan=False).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass # logging every request would cost more than evaluating it
+
+
+class JSONLinesHandler(socketserver.StreamRequestHandler):
+    # Lines are submitted as soon as they are read and answered in order by a writer thread, so a client that sends
+    # many lines without waiting gets them evaluated in as few batches as possible
+    def handle(self):
+        pending = queue.Queue()
+        writer = threading.Thread(target=self._write, args=(pending,))
+        writer.start()
+        try:
+            for line in self.rfile:
+                if not line.strip():
+                    continue
+                try:
+                    request = json.loads(line)
+                except ValueError as error:
+                    failed = Future()
+                    failed.set_exception(ValueError(f'Invalid JSON: {error}'))
+                    pending.put((None, failed))
+                else:
+                    pending.put(submit_request(self.server.batcher, request))
+        finally:
+            pending.put(None)
+            writer.join()
+
+    def _write(self, pending):
+        while (item := pending.get()) is not None:
+            try:
+                self.wfile.write(json.dumps(get_response(*item), allow_nan=False).encode() + b'\n')
+            except OSError:
+                return # client went away; the reader sees the closed connection too
+
+
+# socketserver's default backlog of 5 pending connections resets clients when many connect at the same moment
+class HTTPServer(ThreadingHTTPServer):
+    request_queue_size = 128
+
+
+class ThreadingUnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+
+# This function removes a Unix socket left behind at path. It refuses to remove anything that is not a socket, or a
+# socket that another service is still listening on.
+def remove_socket(path):
+    if os.path.lexists(path):
+        if not stat.S_ISSOCK(os.lstat(path).st_mode):
+            raise ValueError(f'{path} exists and is not a Unix socket; not removing it')
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            try:
+                client.connect(path)
+            except OSError:
+                pass # nothing is listening, so the socket is left over from a stopped service
+            else:
+                raise ValueError(f'{path} is in use by a running service; not removing it')
+        os.remove(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serve TEA and LCA scenario evaluations with request batching.')
+    parser.add_argument('--http', metavar='HOST:PORT', help='listen for HTTP requests, e.g. 127.0.0.1:8765')
+    parser.add_argument('--unix', metavar='PATH', help='listen for JSON lines on a Unix socket')
+    parser.add_argument('--max-batch', type=int, default=512, help='most scenarios evaluated together (default: 512)')
+    parser.add_argument('--max-wait', type=float, default=1.0, help='ms to wait for a batch to fill (default: 1)')
+    args = parser.parse_args()
+    if not args.http and not args.unix:
+        parser.error('give --http and/or --unix')
+
+    batcher = ScenarioBatcher(args.max_batch, args.max_wait / 1000)
+    servers = []
+    if args.http:
+        host, port = args.http.rsplit(':', 1)
+        servers.append(HTTPServer((host, int(port)), HTTPHandler))
+        print(f'Listening for HTTP on http://{host}:{port}/evaluate')
+    if args.unix:
+        try:
+            remove_socket(args.unix)
+        except ValueError as error:
+            parser.error(str(error))
+        servers.append(ThreadingUnixServer(args.unix, JSONLinesHandler))
+        print(f'Listening for JSON lines on {args.unix}')
+
+    threads = []
+    for server in servers:
+        server.batcher = batcher
+        threads.append(threading.Thread(target=server.serve_forever, daemon=True))
+        threads[-1].start()
+    try:
+        for thread in threads:
+            thread.join()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        # stop serving before closing, so the Unix socket is really closed before it is removed
+        for server in servers:
+            server.shutdown()
+            server.server_close()
+        if args.unix:
+            remove_socket(args.unix)
+
+
+if __name__ == '__main__':
+    main()